@@ -0,0 +1,257 @@
+"""벤치마크용 결정적(deterministic) 가짜 객체
+
+OpenAI, gspread, Okt 를 네트워크/JVM 없이 대체합니다.
+같은 seed 와 입력이면 항상 같은 결과를 반환하므로 커밋 간 결과 비교가 가능합니다.
+"""
+import hashlib
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from config import COLUMN_MAPPING
+from data_loader import DataLoader
+from metrics import metrics
+
+
+def _stable_hash(text: str) -> int:
+    """프로세스와 무관하게 고정된 64비트 해시"""
+    return int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'little')
+
+
+class SyntheticEmbedder:
+    """군집 중심 + 노이즈로 임베딩 생성
+
+    같은 군집에 속한 단어끼리는 코사인 유사도가 0.3 을 넘도록 만들어
+    find_most_similar_term 이 실제와 비슷하게 후보를 찾도록 합니다.
+    """
+
+    def __init__(self, dim: int = 1536, n_clusters: int = 20, noise: float = 0.8, seed: int = 0):
+        self.dim = dim
+        self.n_clusters = n_clusters
+        self.noise = noise
+        rng = np.random.default_rng(seed)
+        self.centers = rng.standard_normal((n_clusters, dim))
+
+    def embed(self, text: str) -> np.ndarray:
+        h = _stable_hash(text)
+        rng = np.random.default_rng(h)
+        return self.centers[h % self.n_clusters] + self.noise * rng.standard_normal(self.dim)
+
+
+class _FakeChatCompletions:
+    def __init__(self, owner: 'FakeOpenAI'):
+        self.owner = owner
+
+    def create(self, model: str, messages: List[Dict], max_tokens: int = 100,
+               temperature: float = 0.0, stream: bool = False, **kwargs):
+        prompt = messages[-1]['content']
+        text = self.owner.respond(prompt)
+        usage = SimpleNamespace(
+            prompt_tokens=len(prompt) // 2,
+            completion_tokens=len(text) // 2,
+            total_tokens=(len(prompt) + len(text)) // 2
+        )
+        self.owner.chat_calls += 1
+
+        if stream:
+            return self._stream(text, usage)
+
+        self.owner.sleep(self.owner.latency)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=usage
+        )
+
+    def _stream(self, text: str, usage) -> Iterator:
+        self.owner.sleep(self.owner.ttft)
+        step = self.owner.stream_chunk_chars
+        for i in range(0, len(text), step):
+            self.owner.sleep(self.owner.token_latency)
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=text[i:i + step]))],
+                usage=None
+            )
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+class _FakeEmbeddings:
+    def __init__(self, owner: 'FakeOpenAI'):
+        self.owner = owner
+
+    def create(self, input: List[str], model: str = '', dimensions: Optional[int] = None, **kwargs):
+        self.owner.embedding_calls += 1
+        self.owner.sleep(self.owner.embedding_latency)
+        data = [SimpleNamespace(embedding=self.owner.embedder.embed(text).tolist()) for text in input]
+        tokens = sum(len(text) for text in input)
+        return SimpleNamespace(data=data, usage=SimpleNamespace(prompt_tokens=tokens, total_tokens=tokens))
+
+
+class FakeOpenAI:
+    """openai.OpenAI 호환 가짜 클라이언트
+
+    - chat.completions.create: 약어 추천 프롬프트에는 후보 중 하나 또는 'NONE',
+      신규 생성 프롬프트에는 해시 기반 약어, 그 외에는 고정 길이 정의 문장 반환
+    - embeddings.create: SyntheticEmbedder 로 결정적 벡터 반환
+    - latency / embedding_latency / ttft / token_latency 로 네트워크 지연 모사 (초)
+    """
+
+    CANDIDATES_PATTERN = re.compile(r'표준 약어 목록: (.*)\n')
+
+    def __init__(self, embedder: SyntheticEmbedder, latency: float = 0.0, embedding_latency: float = 0.0,
+                 ttft: float = 0.0, token_latency: float = 0.0, none_rate: float = 0.2,
+                 definition_chars: int = 250, stream_chunk_chars: int = 2):
+        self.embedder = embedder
+        self.latency = latency
+        self.embedding_latency = embedding_latency
+        self.ttft = ttft
+        self.token_latency = token_latency
+        self.none_rate = none_rate
+        self.definition_chars = definition_chars
+        self.stream_chunk_chars = stream_chunk_chars
+        self.chat_calls = 0
+        self.embedding_calls = 0
+        self.chat = SimpleNamespace(completions=_FakeChatCompletions(self))
+        self.embeddings = _FakeEmbeddings(self)
+
+    @staticmethod
+    def sleep(seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def respond(self, prompt: str) -> str:
+        h = _stable_hash(prompt)
+        match = self.CANDIDATES_PATTERN.search(prompt)
+        if match:
+            candidates = match.group(1).split(', ')
+            if (h % 1000) / 1000 < self.none_rate:
+                return 'NONE'
+            return candidates[h % len(candidates)]
+        if '생성된 약어:' in prompt:
+            return f'N{h % 100000:05d}'
+        sentence = '해당 컬럼이 의미하는 값을 설명하는 개선된 정의 문장.'
+        return (sentence * (self.definition_chars // len(sentence) + 1))[:self.definition_chars]
+
+
+class FakeOkt:
+    """konlpy Okt 대체 - 공백 단위로 나누고 조사 목록에 있으면 Josa 로 태깅"""
+
+    JOSA = {'의', '을', '를', '이', '가', '은', '는', '에', '와', '과'}
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def pos(self, text: str) -> List[Tuple[str, str]]:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return [(token, 'Josa' if token in self.JOSA else 'Noun') for token in text.split()]
+
+
+class FakeWorksheet:
+    def __init__(self, title: str, values: List[List[str]]):
+        self.title = title
+        self._values = values
+        self.row_count = len(values)
+        self.col_count = len(values[0]) if values else 0
+
+    def get_all_values(self) -> List[List[str]]:
+        return [list(row) for row in self._values]
+
+    def row_values(self, index: int) -> List[str]:
+        return list(self._values[index - 1])
+
+
+class FakeSpreadsheet:
+    def __init__(self, title: str, worksheets: List[FakeWorksheet]):
+        self.title = title
+        self._worksheets = worksheets
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        return list(self._worksheets)
+
+
+class FakeGspreadClient:
+    """gspread 클라이언트 대체 - open_by_key / openall 지원, latency 초 만큼 지연"""
+
+    def __init__(self, spreadsheet: FakeSpreadsheet, latency: float = 0.0):
+        self.spreadsheet = spreadsheet
+        self.latency = latency
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return self.spreadsheet
+
+    def openall(self) -> List[FakeSpreadsheet]:
+        return [self.spreadsheet]
+
+
+class FakeDataLoader(DataLoader):
+    """엑셀 파일 대신 미리 생성한 임베딩을 반환하는 DataLoader
+
+    실제 로더처럼 호출마다 새 배열을 만들어 반환하므로 임베딩 메모리가 적재 단계에 잡힙니다.
+    """
+
+    def __init__(self, gc: FakeGspreadClient, embeddings: List[np.ndarray]):
+        super().__init__(gc=gc)
+        self._embeddings = embeddings
+
+    @metrics.timer('load_embeddings_from_excel')
+    def load_embeddings_from_excel(self, excel_path: str, sheet_name: str = "공통표준단어", column_name: str = "embedding") -> List[np.ndarray]:
+        return [np.array(emb) for emb in self._embeddings]
+
+
+class SyntheticDictionary:
+    """합성 용어사전(Sheet1) / 단어사전(Sheet2) + 단어 임베딩
+
+    단어는 '단어000001' 형식이고 약어는 'W000001' 형식입니다.
+    용어는 단어 2개를 이어 붙인 조합이며 약어는 단어 약어를 '_' 로 연결합니다.
+    """
+
+    def __init__(self, n_words: int, embedder: SyntheticEmbedder, n_terms: Optional[int] = None, seed: int = 0):
+        self.n_words = n_words
+        self.n_terms = n_terms if n_terms is not None else max(1, n_words // 2)
+        rng = np.random.default_rng(seed)
+
+        self.words = [f'단어{i:06d}' for i in range(n_words)]
+        self.abbrs = [f'W{i:06d}' for i in range(n_words)]
+        self.embeddings = [embedder.embed(word) for word in self.words]
+
+        pairs = rng.integers(0, n_words, size=(self.n_terms, 2))
+        self.terms = []
+        for i, (a, b) in enumerate(pairs):
+            self.terms.append({
+                'name': self.words[a] + self.words[b],
+                'desc': f'{self.words[a]} {self.words[b]} 정보.',
+                'abbr': f'{self.abbrs[a]}_{self.abbrs[b]}'
+            })
+
+    def spreadsheet(self) -> FakeSpreadsheet:
+        # Sheet1 은 4번째 컬럼이 약어여야 함 (DataLoader.load_data_rec 참고)
+        sheet1 = [[COLUMN_MAPPING['term_name'], COLUMN_MAPPING['term_desc'],
+                   COLUMN_MAPPING['domain'], COLUMN_MAPPING['term_abbr']]]
+        sheet1 += [[t['name'], t['desc'], '명V100', t['abbr']] for t in self.terms]
+
+        sheet2 = [[COLUMN_MAPPING['word_name'], COLUMN_MAPPING['word_abbr']]]
+        sheet2 += [[w, a] for w, a in zip(self.words, self.abbrs)]
+
+        return FakeSpreadsheet('synthetic', [
+            FakeWorksheet('공통표준용어', sheet1),
+            FakeWorksheet('공통표준단어', sheet2)
+        ])
+
+    def queries(self, count: int, words_per_query: int = 3, unknown_rate: float = 0.5, seed: int = 1) -> List[str]:
+        """검색어 생성 - 사전 단어와 사전에 없는 단어, 조사를 섞음"""
+        rng = np.random.default_rng(seed)
+        result = []
+        for q in range(count):
+            tokens = []
+            for k in range(words_per_query):
+                if rng.random() < unknown_rate:
+                    tokens.append(f'신규{q:05d}{k}')
+                else:
+                    tokens.append(self.words[rng.integers(0, self.n_words)])
+                if k < words_per_query - 1:
+                    tokens.append('의')
+            result.append(' '.join(tokens))
+        return result
@@ -0,0 +1,299 @@
+"""오프라인 성능 벤치마크
+
+OpenAI / Google Sheets / KoNLPy 없이 가짜 객체(benchmarks/fakes.py)로
+시스템 초기화, 단일 요청 지연 시간(p50/p90/p99), 배치 처리량, 단계별 최대 메모리를 측정합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 --output bench.json
+    python -m benchmarks.run_benchmarks --sizes 1000 --compare bench.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List
+import numpy as np
+from metrics import metrics
+from openai_client import OpenAIClient
+from term_processor import TermProcessor
+from benchmarks.fakes import (
+    FakeDataLoader, FakeGspreadClient, FakeOkt, FakeOpenAI, SyntheticDictionary, SyntheticEmbedder
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return 'unknown'
+
+
+def _percentiles(samples: List[float]) -> Dict:
+    arr = np.array(samples)
+    return {
+        'n': len(samples),
+        'mean': float(arr.mean()),
+        'p50': float(np.percentile(arr, 50)),
+        'p90': float(np.percentile(arr, 90)),
+        'p99': float(np.percentile(arr, 99)),
+        'max': float(arr.max())
+    }
+
+
+def _peak_memory_mb(fn: Callable):
+    """fn 실행 중 Python 힙 최대 증가량(MB)과 반환값
+
+    metrics.memory_phase 로 측정하므로 내부 단계별 측정(track_memory)과 함께 써도
+    구간 전체의 최대값이 유지됩니다.
+    """
+    tracemalloc.start()
+    try:
+        with metrics.memory_phase() as phase:
+            result = fn()
+    finally:
+        tracemalloc.stop()
+    return phase['peak_bytes'] / (1024 * 1024), result
+
+
+def _stage_summary() -> Dict:
+    stages = {}
+    for s in metrics.snapshot()['summaries']:
+        if s['name'] == 'stage_seconds':
+            stages[s['labels']['stage']] = {
+                'count': s['count'],
+                'mean': s['sum'] / s['count'],
+                'max': s['max']
+            }
+    return stages
+
+
+def _stage_peak_memory() -> Dict:
+    """metrics.track_memory 로 기록된 단계별 최대 메모리 증가량(MB)"""
+    return {
+        s['labels']['stage']: s['max'] / (1024 * 1024)
+        for s in metrics.snapshot()['summaries'] if s['name'] == 'stage_peak_bytes'
+    }
+
+
+def run_size(n_words: int, args) -> Dict:
+    """사전 크기 하나에 대한 벤치마크
+
+    1) 시간 측정: 워밍업 후 metrics 를 초기화하고 tracemalloc 없이 측정
+    2) 메모리 측정: 마지막에 tracemalloc 을 켜고 같은 흐름을 다시 실행
+    """
+    embedder = SyntheticEmbedder(dim=args.dim, n_clusters=max(1, n_words // args.cluster_size), seed=args.seed)
+    dictionary = SyntheticDictionary(n_words, embedder, seed=args.seed)
+    queries = dictionary.queries(args.queries + args.warmup, seed=args.seed + 1)
+    batch = dictionary.queries(args.batch, seed=args.seed + 2)
+    abbrs = [t['abbr'] for t in dictionary.terms[:args.queries + args.warmup]]
+
+    def build():
+        fake_openai = FakeOpenAI(
+            embedder,
+            latency=args.latency_ms / 1000,
+            embedding_latency=args.embedding_latency_ms / 1000,
+            ttft=args.latency_ms / 1000,
+            token_latency=args.token_latency_ms / 1000
+        )
+        gc = FakeGspreadClient(dictionary.spreadsheet(), latency=args.sheet_latency_ms / 1000)
+        loader = FakeDataLoader(gc, dictionary.embeddings)
+        client = OpenAIClient(client=fake_openai)
+        return TermProcessor(client, loader, embedding_client=fake_openai, okt=FakeOkt())
+
+    def improve(processor, abbr, stream: bool):
+        # CLI 경로처럼 매번 데이터를 다시 읽음
+        terms, _ = processor.data_loader.load_data()
+        on_token = (lambda token: None) if stream else None
+        return processor.improve_term_definition(abbr, terms, on_token=on_token)
+
+    result = {'n_words': n_words, 'n_terms': dictionary.n_terms}
+
+    # ===== 시간 측정 =====
+    # 시스템 초기화 - 여러 번 반복하여 분포로 기록, 적재 단계 소요 시간은 별도 스냅샷
+    metrics.reset()
+    samples = []
+    for _ in range(args.startup_repeats):
+        processor = None
+        start = time.perf_counter()
+        processor = build()
+        samples.append(time.perf_counter() - start)
+    result['startup'] = _percentiles(samples)
+    result['startup_stages'] = _stage_summary()
+
+    for q in queries[:args.warmup]:
+        processor.recommend_abbreviation(q)
+    for abbr in abbrs[:args.warmup]:
+        improve(processor, abbr, stream=False)
+        improve(processor, abbr, stream=True)
+    metrics.reset()
+
+    # 단일 요청 지연 시간
+    samples = []
+    for q in queries[args.warmup:]:
+        t0 = time.perf_counter()
+        processor.recommend_abbreviation(q)
+        samples.append(time.perf_counter() - t0)
+    result['recommend_abbreviation'] = _percentiles(samples)
+
+    # 배치 처리량
+    t0 = time.perf_counter()
+    for q in batch:
+        processor.recommend_abbreviation(q)
+    elapsed = time.perf_counter() - t0
+    result['batch'] = {'queries': len(batch), 'seconds': elapsed, 'qps': len(batch) / elapsed if elapsed else None}
+
+    # 정의 개선 (일반 / 스트리밍)
+    samples, stream_samples, ttft_samples = [], [], []
+    for abbr in abbrs[args.warmup:]:
+        t0 = time.perf_counter()
+        improve(processor, abbr, stream=False)
+        samples.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        res = improve(processor, abbr, stream=True)
+        stream_samples.append(time.perf_counter() - t0)
+        if res.get('ttft') is not None:
+            ttft_samples.append(res['ttft'])
+    result['improve_term_definition'] = _percentiles(samples)
+    result['improve_term_definition_stream'] = _percentiles(stream_samples)
+    if ttft_samples:
+        result['improve_term_definition_stream']['ttft'] = _percentiles(ttft_samples)
+
+    result['stages'] = _stage_summary()
+    del processor
+
+    # ===== 메모리 측정 (tracemalloc 오버헤드가 시간 측정에 섞이지 않도록 마지막에 실행) =====
+    metrics.reset()
+    metrics.track_memory = True
+    try:
+        peak = {}
+        peak['startup'], processor = _peak_memory_mb(build)
+        peak['recommend_abbreviation'], _ = _peak_memory_mb(lambda: processor.recommend_abbreviation(queries[-1]))
+        peak['batch'], _ = _peak_memory_mb(lambda: [processor.recommend_abbreviation(q) for q in batch])
+        peak['improve_term_definition'], _ = _peak_memory_mb(lambda: improve(processor, abbrs[-1], stream=False))
+        result['peak_memory_mb'] = peak
+        result['stage_peak_memory_mb'] = _stage_peak_memory()
+
+        # 구간 최대값은 그 안의 어떤 단계 최대값보다 작을 수 없음
+        largest_stage = max(result['stage_peak_memory_mb'].values(), default=0)
+        if max(peak.values()) < largest_stage:
+            logger.warning(f'⚠️ 구간 최대 메모리({max(peak.values()):.2f}MB)가 '
+                           f'단계 최대 메모리({largest_stage:.2f}MB)보다 작습니다')
+    finally:
+        metrics.track_memory = False
+    return result
+
+
+def _format_number(value, spec: str = '.1f') -> str:
+    return '-' if value is None else format(value, spec)
+
+
+def compare(current: Dict, baseline: Dict):
+    """기준 결과 대비 주요 지표 비율 출력 (batch qps 외에는 1.0 미만이면 개선)"""
+    base_by_size = {r['n_words']: r for r in baseline['results']}
+    print(f"\n📊 비교: {baseline['meta']['commit']} → {current['meta']['commit']}")
+
+    # 실행 조건이 다르면 비율을 그대로 비교할 수 없음
+    ignored = {'output', 'compare'}
+    base_args = baseline['meta'].get('args', {})
+    cur_args = current['meta'].get('args', {})
+    for key in sorted((set(base_args) | set(cur_args)) - ignored):
+        if base_args.get(key) != cur_args.get(key):
+            print(f"  ⚠️ 실행 조건 다름: {key} = {base_args.get(key)} → {cur_args.get(key)}")
+
+    keys = [
+        ('startup p50', lambda r: r['startup']['p50']),
+        ('recommend p50', lambda r: r['recommend_abbreviation']['p50']),
+        ('recommend p99', lambda r: r['recommend_abbreviation']['p99']),
+        ('batch qps', lambda r: r['batch']['qps']),
+        ('improve p50', lambda r: r['improve_term_definition']['p50']),
+        ('peak batch MB', lambda r: r['peak_memory_mb']['batch'])
+    ]
+    for r in current['results']:
+        base = base_by_size.get(r['n_words'])
+        if not base:
+            print(f"  {r['n_words']}단어: 기준 결과 없음")
+            continue
+        print(f"  {r['n_words']}단어:")
+        for name, get in keys:
+            try:
+                old, new = get(base), get(r)
+            except KeyError:
+                print(f"    {name:<16} 지표 없음")
+                continue
+            ratio = new / old if old and new is not None else None
+            print(f"    {name:<16} {_format_number(old, '>10.4f')} → {_format_number(new, '>10.4f')}"
+                  f"  (x{_format_number(ratio, '.2f')})")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='용어 추천 시스템 오프라인 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+                        help='단어사전 크기 목록 (예: 1000 10000 100000 500000)')
+    parser.add_argument('--dim', type=int, default=1536, help='임베딩 차원')
+    parser.add_argument('--cluster-size', type=int, default=50, help='군집당 평균 단어 수 (유사 후보 수)')
+    parser.add_argument('--queries', type=int, default=50, help='지연 시간 측정 요청 수')
+    parser.add_argument('--warmup', type=int, default=5, help='워밍업 요청 수')
+    parser.add_argument('--startup-repeats', type=int, default=5, help='시스템 초기화 반복 측정 횟수')
+    parser.add_argument('--batch', type=int, default=100, help='배치 처리량 측정 요청 수')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='가짜 chat 호출 지연 (ms)')
+    parser.add_argument('--embedding-latency-ms', type=float, default=0.0, help='가짜 embedding 호출 지연 (ms)')
+    parser.add_argument('--token-latency-ms', type=float, default=0.0, help='스트리밍 청크 간 지연 (ms)')
+    parser.add_argument('--sheet-latency-ms', type=float, default=0.0, help='가짜 스프레드시트 열기 지연 (ms)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', help='비교할 기준 결과 JSON 경로')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'args': vars(args)
+        },
+        'results': []
+    }
+
+    for n_words in args.sizes:
+        print(f"⏱️ {n_words}단어 벤치마크 중...", file=sys.stderr)
+        # 파이프라인의 print 출력은 측정에서 제외
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            result = run_size(n_words, args)
+        report['results'].append(result)
+        rec = result['recommend_abbreviation']
+        print(f"  시작 p50 {result['startup']['p50']:.3f}s | 추천 p50 {rec['p50'] * 1000:.2f}ms "
+              f"p99 {rec['p99'] * 1000:.2f}ms | 배치 {_format_number(result['batch']['qps'])} qps", file=sys.stderr)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
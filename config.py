@@ -41,4 +41,17 @@ OPENAI_CONFIG_REC = {
 # ===== 파일 경로 =====
 # 기본 경로 (환경변수로 오버라이드 가능)
 DEFAULT_FILE_PATH = 'embeddingData_v1(0829).xlsx'
-FILE_PATH = os.getenv('EXCEL_FILE_PATH', DEFAULT_FILE_PATH)
\ No newline at end of file
+FILE_PATH = os.getenv('EXCEL_FILE_PATH', DEFAULT_FILE_PATH)
+
+# ===== 성능 지표 설정 =====
+# METRICS_ENABLED=0 으로 비활성화, METRICS_DUMP_PATH 지정 시 종료할 때 Prometheus 텍스트로 저장
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') != '0'
+METRICS_DUMP_PATH = os.getenv('METRICS_DUMP_PATH', '')
+
+
+# ===== 사전 점검 설정 =====
+AUDIT_CONFIG = {
+    'similarity_threshold': 0.9,   # 이 값 이상이면서 약어가 다른 단어 쌍을 보고
+    'block_size': 2048             # 블록 단위 행렬 곱 크기 (메모리 사용량 ≈ block_size² × 4바이트)
+}
+AUDIT_REPORT_PATH = os.getenv('AUDIT_REPORT_PATH', 'dictionary_audit.jsonl')
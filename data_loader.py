@@ -4,14 +4,17 @@ from typing import Dict, List, Tuple, Optional
 import logging
 from config import SPREADSHEET_ID, FILE_PATH
 import numpy as np
+from metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 class DataLoader:
-    def __init__(self, credentials_path: Optional[str] = None):
+    def __init__(self, credentials_path: Optional[str] = None, gc=None):
+        # gc: gspread 클라이언트 호환 객체 주입 시 OAuth 인증 생략
         self.credentials_path = credentials_path
-        self.gc = None
-        self._setup_credentials()
+        self.gc = gc
+        if self.gc is None:
+            self._setup_credentials()
     
     def _setup_credentials(self):
         """Google Sheets API 인증 설정"""
@@ -33,6 +36,7 @@ class DataLoader:
             print(f"❌ 인증 실패: {e}")        
             self.gc = None
     
+    @metrics.timer('read_spreadsheet_data')
     def read_spreadsheet_data(self, spreadsheet_id: str = SPREADSHEET_ID) -> Dict:
         """스프레드시트 데이터 읽기"""
         try:
@@ -47,7 +51,9 @@ class DataLoader:
                 sheet_name = worksheet.title
 
                 try:
-                    all_values = worksheet.get_all_values()
+                    with metrics.timer('worksheet_get_all_values'):
+                        all_values = worksheet.get_all_values()
+                    metrics.incr('gspread_api_calls_total', kind='get_all_values')
 
                     if not all_values:
                         logger.warning(f"⚠️ {sheet_name}: 데이터 없음")
@@ -116,6 +122,7 @@ class DataLoader:
         
         return terms, words
 
+    @metrics.timer('load_data_rec')
     def load_data_rec(self, terms: List[Dict], words: List[Dict]) -> Tuple[List[str], List[str], List[str], List[np.ndarray]]:
         sheet1_abbr_list = []
         term_data = []
@@ -145,6 +152,7 @@ class DataLoader:
             abbr_data.append(abbr)
         return sheet1_abbr_list, term_data, abbr_data, term_embeddings
 
+    @metrics.timer('load_embeddings_from_excel')
     def load_embeddings_from_excel(self, excel_path: str, sheet_name: str = "공통표준단어", column_name: str = "embedding") -> List[np.ndarray]:
         print(f"엑셀 파일 경로: {excel_path}")
         
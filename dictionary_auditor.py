@@ -0,0 +1,181 @@
+import argparse
+import json
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from config import AUDIT_CONFIG, AUDIT_REPORT_PATH
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class DictionaryAuditor:
+    """표준 사전 전체의 유사 단어/약어 충돌 점검
+
+    - 단어사전(Sheet2) 임베딩을 블록 단위 행렬 곱으로 비교하여
+      의미가 거의 같은데 약어가 다른 단어 쌍을 찾음 (메모리 O(n + block_size²))
+    - 약어 하나에 여러 단어, 단어 하나에 여러 약어가 쓰인 경우를 정확히 검사
+    - 용어사전(Sheet1) 약어의 중복과 순서만 다른 동일 조합을 검사
+    결과는 한 줄에 하나씩 JSON Lines 로 바로 기록합니다.
+    """
+
+    def __init__(self, term_data: List[str], abbr_data: List[str], term_embeddings: List[np.ndarray],
+                 sheet1_abbr_list: List[str], threshold: float = AUDIT_CONFIG['similarity_threshold'],
+                 block_size: int = AUDIT_CONFIG['block_size']):
+        # 결과 파일을 열기 전에 잘못된 설정을 거름
+        if block_size <= 0:
+            raise ValueError(f'block_size 는 1 이상이어야 합니다: {block_size}')
+        if not 0 < threshold <= 1:
+            raise ValueError(f'threshold 는 0 초과 1 이하여야 합니다: {threshold}')
+        self.term_data = term_data
+        self.abbr_data = abbr_data
+        self.term_embeddings = term_embeddings
+        self.sheet1_abbr_list = sheet1_abbr_list
+        self.threshold = threshold
+        self.block_size = block_size
+
+    def find_abbr_conflicts(self) -> Iterator[Dict]:
+        """단어사전 약어 충돌 - 같은 약어/다른 단어, 같은 단어/다른 약어"""
+        words_by_abbr = defaultdict(set)
+        abbrs_by_word = defaultdict(set)
+        for term, abbr in zip(self.term_data, self.abbr_data):
+            if not term or not abbr:
+                continue
+            words_by_abbr[abbr].add(term)
+            abbrs_by_word[term].add(abbr)
+
+        for abbr, words in words_by_abbr.items():
+            if len(words) > 1:
+                yield {'type': 'abbr_multiple_words', 'abbr': abbr, 'words': sorted(words)}
+
+        for term, abbrs in abbrs_by_word.items():
+            if len(abbrs) > 1:
+                yield {'type': 'word_multiple_abbrs', 'word': term, 'abbrs': sorted(abbrs)}
+
+    def find_sheet1_conflicts(self) -> Iterator[Dict]:
+        """용어사전 약어 충돌 - 완전 중복, 구성 약어가 같고 순서만 다른 조합"""
+        counts = Counter(abbr for abbr in self.sheet1_abbr_list if abbr)
+        for abbr, count in counts.items():
+            if count > 1:
+                yield {'type': 'sheet1_duplicate_abbr', 'abbr': abbr, 'count': count}
+
+        # find_permutation_match 는 순서를 무시하므로 여러 후보가 있으면 결과가 모호해짐
+        by_parts = defaultdict(list)
+        for abbr in counts:
+            by_parts[frozenset(abbr.split('_'))].append(abbr)
+        for abbrs in by_parts.values():
+            if len(abbrs) > 1:
+                yield {'type': 'sheet1_permutation_conflict', 'abbrs': sorted(abbrs)}
+
+    def _embedding_matrix(self) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """유효한 임베딩만 모아 행 단위로 정규화한 float32 행렬과 원래 인덱스 반환"""
+        dims = Counter(len(emb) for emb in self.term_embeddings if emb is not None)
+        if not dims:
+            return None, np.array([], dtype=np.int64)
+        dim = dims.most_common(1)[0][0]
+
+        n = min(len(self.term_data), len(self.term_embeddings))
+        indices = np.array(
+            [i for i in range(n) if self.term_embeddings[i] is not None and len(self.term_embeddings[i]) == dim],
+            dtype=np.int64
+        )
+        matrix = np.empty((len(indices), dim), dtype=np.float32)
+        for row, i in enumerate(indices):
+            matrix[row] = self.term_embeddings[i]
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        matrix /= norms
+
+        skipped = n - len(indices)
+        if skipped:
+            logger.info(f'⚠️ 임베딩 없음/차원 불일치로 {skipped}개 단어 제외')
+        return matrix, indices
+
+    def find_similar_pairs(self) -> Iterator[Dict]:
+        """임베딩 유사도가 threshold 이상인데 약어가 다른 단어 쌍"""
+        matrix, indices = self._embedding_matrix()
+        if matrix is None:
+            return
+
+        n = len(indices)
+        block = self.block_size
+        n_blocks = (n + block - 1) // block
+        logger.info(f'🔍 유사 단어 점검: {n}개 단어, {n_blocks}x{n_blocks} 블록')
+
+        for start_i in range(0, n, block):
+            rows = matrix[start_i:start_i + block]
+            for start_j in range(start_i, n, block):
+                # 기록 시간(JSON 직렬화/파일 쓰기)이 섞이지 않도록 계산 부분만 측정
+                with metrics.timer('audit_similarity_block'):
+                    sims = rows @ matrix[start_j:start_j + block].T
+                    row_idx, col_idx = np.nonzero(sims >= self.threshold)
+                    if start_i == start_j:
+                        # 대각 블록은 위쪽 삼각형만 (자기 자신/중복 쌍 제외)
+                        upper = row_idx < col_idx
+                        row_idx, col_idx = row_idx[upper], col_idx[upper]
+
+                for r, c in zip(row_idx, col_idx):
+                    a = int(indices[start_i + r])
+                    b = int(indices[start_j + c])
+                    word_a, word_b = self.term_data[a], self.term_data[b]
+                    abbr_a, abbr_b = self.abbr_data[a], self.abbr_data[b]
+                    # 같은 단어는 find_abbr_conflicts 에서 검사
+                    if abbr_a == abbr_b or word_a == word_b:
+                        continue
+                    yield {
+                        'type': 'similar_words_diff_abbr',
+                        'similarity': round(float(sims[r, c]), 4),
+                        'word_a': word_a, 'abbr_a': abbr_a,
+                        'word_b': word_b, 'abbr_b': abbr_b
+                    }
+            logger.info(f'  {start_i // block + 1}/{n_blocks} 블록 행 완료')
+
+    def run(self, output_path: str = AUDIT_REPORT_PATH) -> Dict[str, int]:
+        """전체 점검을 실행하고 결과를 JSON Lines 로 저장, 유형별 건수 반환"""
+        summary = Counter()
+        logger.info(f'🧾 사전 점검 시작 → {output_path}')
+
+        with metrics.timer('dictionary_audit'), open(output_path, 'w', encoding='utf-8') as f:
+            for finder in (self.find_abbr_conflicts, self.find_sheet1_conflicts, self.find_similar_pairs):
+                for record in finder():
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    summary[record['type']] += 1
+
+        for kind, count in summary.items():
+            metrics.incr('audit_flagged_total', count, type=kind)
+        logger.info(f'✅ 사전 점검 완료: {dict(summary)}')
+        return dict(summary)
+
+
+def main(argv=None):
+    """명령행 실행 - 스프레드시트/엑셀에서 사전을 읽어 점검"""
+    from data_loader import DataLoader
+
+    parser = argparse.ArgumentParser(description='표준 사전 유사 단어/약어 충돌 점검')
+    parser.add_argument('--output', default=AUDIT_REPORT_PATH, help='결과 JSON Lines 경로')
+    parser.add_argument('--threshold', type=float, default=AUDIT_CONFIG['similarity_threshold'], help='유사도 임계값')
+    parser.add_argument('--block-size', type=int, default=AUDIT_CONFIG['block_size'], help='블록 크기')
+    args = parser.parse_args(argv)
+    # 스프레드시트를 읽기 전에 잘못된 옵션을 거름
+    if args.block_size <= 0:
+        parser.error('--block-size 는 1 이상이어야 합니다')
+    if not 0 < args.threshold <= 1:
+        parser.error('--threshold 는 0 초과 1 이하여야 합니다')
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    data_loader = DataLoader()
+    terms, words = data_loader.load_data()
+    sheet1_abbr_list, term_data, abbr_data, term_embeddings = data_loader.load_data_rec(terms, words)
+
+    auditor = DictionaryAuditor(term_data, abbr_data, term_embeddings, sheet1_abbr_list,
+                                threshold=args.threshold, block_size=args.block_size)
+    summary = auditor.run(args.output)
+    for kind, count in summary.items():
+        print(f'{kind}: {count}건')
+
+
+if __name__ == '__main__':
+    main()
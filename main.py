@@ -1,8 +1,11 @@
 import logging
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Callable
 from data_loader import DataLoader
 from openai_client import OpenAIClient
 from term_processor import TermProcessor
+from dictionary_auditor import DictionaryAuditor
+from metrics import metrics
+from config import METRICS_DUMP_PATH, AUDIT_REPORT_PATH
 
 # 로깅 설정
 logging.basicConfig(
@@ -24,15 +27,28 @@ class TermRecommendationSystem:
         logger.info("📊 데이터 로드 중...")
         return self.data_loader.load_data()
 
-    def improve_term_definition(self, term_abbr: str) -> Dict:
-        """용어 정의 개선"""
-        terms, _ = self.load_data()
-        return self.term_processor.improve_term_definition(term_abbr, terms)
+    def improve_term_definition(self, term_abbr: str, on_token: Optional[Callable[[str], None]] = None) -> Dict:
+        """용어 정의 개선 - on_token 을 넘기면 토큰 단위 스트리밍"""
+        # 스프레드시트 재로딩 시간도 요청 기록에 포함
+        metrics.start_trace('improve_term_definition', term_abbr=term_abbr, stream=on_token is not None)
+        try:
+            terms, _ = self.load_data()
+            return self.term_processor.improve_term_definition(term_abbr, terms, on_token)
+        finally:
+            metrics.end_trace()
 
     def recommend_abbreviation(self, search_query: str) -> List[str]:
         """약어 추천"""
         return self.term_processor.recommend_abbreviation(search_query)
 
+    def audit_dictionary(self, output_path: str = AUDIT_REPORT_PATH) -> Dict[str, int]:
+        """표준 사전 유사 단어/약어 충돌 점검"""
+        processor = self.term_processor
+        auditor = DictionaryAuditor(
+            processor.term_data, processor.abbr_data, processor.term_embeddings, processor.sheet1_abbr_list
+        )
+        return auditor.run(output_path)
+
 def display_menu():
     """메뉴 표시"""
     print("\n" + "="*50)
@@ -40,7 +56,9 @@ def display_menu():
     print("="*50)
     print("1. 용어 정의 개선")
     print("2. 약어 추천")
-    print("3. 시스템 종료")
+    print("3. 성능 지표 보기")
+    print("4. 사전 중복/충돌 점검")
+    print("5. 시스템 종료")
     print("-" * 50)
 
 def improve_term_interactive(system):
@@ -62,15 +80,30 @@ def improve_term_interactive(system):
         print("-" * 30)
         
         try:
-            result = system.improve_term_definition(term_abbr)
+            streamed = []
+
+            def print_token(token: str):
+                # 첫 토큰 도착 시 헤더 출력 후 토큰을 이어서 출력
+                if not streamed:
+                    print("\n✨ 개선된 정의 (실시간):")
+                    print("   ", end='')
+                streamed.append(token)
+                print(token, end='', flush=True)
+
+            result = system.improve_term_definition(term_abbr, on_token=print_token)
+            if streamed:
+                print()
             
             if result.get('success'):
-                print("✅ 정의 개선 완료!")
+                print("\n✅ 정의 개선 완료!")
                 print(f"\n📌 용어 약어: {term_abbr}")
                 print(f"📝 원본 정의:")
                 print(f"   {result.get('current_definition', '')}")
-                print(f"\n✨ 개선된 정의:")
-                print(f"   {result.get('improved_definition', '')}")
+                if not streamed:
+                    print(f"\n✨ 개선된 정의:")
+                    print(f"   {result.get('improved_definition', '')}")
+                if result.get('ttft') is not None:
+                    print(f"\n⏱️ 첫 토큰: {result['ttft']:.2f}초 / 전체: {result['total_latency']:.2f}초")
             else:
                 print("❌ 정의 개선 실패!")
                 print(f"사유: {result.get('message', '')}")
@@ -125,6 +158,31 @@ def recommend_abbreviation_interactive(system):
         if continue_choice != 'y':
             break
 
+def show_metrics():
+    """성능 지표 출력 (Prometheus 텍스트 포맷)"""
+    print("\n📈 성능 지표")
+    print("=" * 30)
+    print(metrics.to_prometheus())
+
+def audit_dictionary_interactive(system):
+    """사전 중복/충돌 점검 - 인터랙티브"""
+    print("\n🧾 사전 중복/충돌 점검")
+    print("=" * 30)
+
+    output_path = input(f"결과 파일 경로를 입력하세요 [기본값: {AUDIT_REPORT_PATH}]: ").strip() or AUDIT_REPORT_PATH
+
+    try:
+        summary = system.audit_dictionary(output_path)
+        print("✅ 점검 완료!")
+        if summary:
+            for kind, count in summary.items():
+                print(f"   {kind}: {count}건")
+        else:
+            print("   발견된 문제가 없습니다.")
+        print(f"📄 결과 파일: {output_path}")
+    except Exception as e:
+        print(f"❌ 오류 발생: {e}")
+
 def main():
     """메인 실행 함수 - 인터랙티브 버전"""
     logger = logging.getLogger(__name__)
@@ -136,17 +194,21 @@ def main():
         
         while True:
             display_menu()
-            choice = input("원하는 기능을 선택하세요 (1-3): ").strip()
+            choice = input("원하는 기능을 선택하세요 (1-5): ").strip()
             
             if choice == '1':
                 improve_term_interactive(system)
             elif choice == '2':
                 recommend_abbreviation_interactive(system)
             elif choice == '3':
+                show_metrics()
+            elif choice == '4':
+                audit_dictionary_interactive(system)
+            elif choice == '5':
                 print("\n👋 시스템을 종료합니다. 이용해 주셔서 감사합니다!")
                 break
             else:
-                print("❌ 올바른 번호를 선택해주세요 (1-3)")
+                print("❌ 올바른 번호를 선택해주세요 (1-5)")
         
     except KeyboardInterrupt:
         print("\n\n👋 사용자에 의해 시스템이 종료되었습니다.")
@@ -154,6 +216,9 @@ def main():
         logger.error(f"시스템 실행 중 오류 발생: {e}")
         print(f"❌ 시스템 오류: {e}")
         print("🔧 문제가 지속되면 관리자에게 문의해주세요.")
+    finally:
+        if METRICS_DUMP_PATH:
+            metrics.dump_prometheus(METRICS_DUMP_PATH)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
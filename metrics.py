@@ -0,0 +1,266 @@
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from itertools import groupby
+from typing import Dict, Iterator, Optional, Tuple
+from config import METRICS_ENABLED
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Metrics:
+    """단계별 소요 시간, 토큰 사용량, API 호출 수, 캐시 적중을 집계하는 경량 계측기
+
+    - incr(): 누적 카운터 (예: API 호출 수, 토큰 수)
+    - observe(): 값의 count/sum/max 요약 (예: 단계별 소요 시간)
+    - timer()/record_stage(): 코드 블록 소요 시간을 stage 라벨로 기록
+    - start_trace()/end_trace(): 요청 하나에 대한 단계별 기록을 JSON 로그로 출력
+      (중첩 호출 시 가장 바깥 요청 하나로 합쳐짐)
+    """
+
+    def __init__(self, enabled: bool = True, prefix: str = 'termrec'):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._summaries: Dict[Tuple[str, LabelKey], list] = {}
+        self._local = threading.local()
+        # 벤치마크 전용: tracemalloc 실행 중이면 timer() 단계별 최대 메모리도 기록
+        self.track_memory = False
+
+    @staticmethod
+    def _label_key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def _current_trace(self) -> Optional[Dict]:
+        return getattr(self._local, 'trace', None)
+
+    @staticmethod
+    def _trace_key(name: str, labels: LabelKey) -> str:
+        """요청 단위 JSON 로그용 키 (예: lookup_total{result=hit,source=term_data})"""
+        if not labels:
+            return name
+        return name + '{' + ','.join(f'{k}={v}' for k, v in labels) + '}'
+
+    def incr(self, name: str, value: float = 1, **labels):
+        """카운터 증가"""
+        if not self.enabled:
+            return
+        key = (name, self._label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+        trace = self._current_trace()
+        if trace is not None:
+            trace_key = self._trace_key(*key)
+            trace['counters'][trace_key] = trace['counters'].get(trace_key, 0) + value
+            if name == 'openai_api_calls_total':
+                trace['api_calls'] += value
+
+    def observe(self, name: str, value: float, **labels):
+        """요약 지표에 값 기록 (count, sum, max)"""
+        if not self.enabled:
+            return
+        key = (name, self._label_key(labels))
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                self._summaries[key] = [1, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                if value > summary[2]:
+                    summary[2] = value
+
+    def record_stage(self, stage: str, seconds: float):
+        """단계 소요 시간을 stage_seconds{stage=...} 와 현재 요청 기록에 함께 기록"""
+        if not self.enabled:
+            return
+        self.observe('stage_seconds', seconds, stage=stage)
+
+        trace = self._current_trace()
+        if trace is not None:
+            trace['stages'][stage] = trace['stages'].get(stage, 0) + seconds
+
+    def annotate(self, **fields):
+        """현재 요청 기록에 필드 추가 (예: 첫 토큰 시간)"""
+        trace = self._current_trace()
+        if trace is not None:
+            trace['fields'].update(fields)
+
+    def _memory_enter(self):
+        stack = getattr(self._local, 'memory_stack', None)
+        if stack is None:
+            stack = self._local.memory_stack = []
+        current, peak = tracemalloc.get_traced_memory()
+        # reset_peak 전에 바깥 단계의 최대값 보존
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        stack.append([current, current])
+
+    def _memory_exit(self) -> int:
+        """진입 시점 대비 최대 메모리 증가량(바이트) 반환 - 바깥 단계에 최대값 전달"""
+        stack = self._local.memory_stack
+        base, peak = stack.pop()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        return peak - base
+
+    @contextmanager
+    def memory_phase(self) -> Iterator[Dict]:
+        """tracemalloc 실행 중 블록 전체의 최대 메모리 증가량을 측정 (벤치마크용)
+
+        내부 timer() 단계가 reset_peak 을 호출해도 최대값이 유지되도록
+        같은 메모리 스택에 바깥 단계로 올라갑니다. 종료 후 result['peak_bytes'] 에 기록됩니다.
+        """
+        result = {'peak_bytes': None}
+        self._memory_enter()
+        try:
+            yield result
+        finally:
+            result['peak_bytes'] = self._memory_exit()
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """블록 소요 시간을 stage_seconds{stage=...} 로 기록 (데코레이터로도 사용 가능)
+
+        track_memory 가 켜져 있고 tracemalloc 이 실행 중이면
+        단계 진입 시점 대비 최대 메모리 증가량을 stage_peak_bytes{stage=...} 로 기록합니다.
+        """
+        if not self.enabled:
+            yield
+            return
+        track = self.track_memory and tracemalloc.is_tracing()
+        if track:
+            self._memory_enter()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - start)
+            if track:
+                self.observe('stage_peak_bytes', self._memory_exit(), stage=stage)
+
+    def start_trace(self, kind: str, **fields):
+        """현재 스레드에서 요청 단위 기록 시작 - 이미 진행 중이면 필드만 추가"""
+        if not self.enabled:
+            return
+        trace = self._current_trace()
+        if trace is not None:
+            trace['depth'] += 1
+            for key, value in fields.items():
+                trace['fields'].setdefault(key, value)
+            return
+        self._local.trace = {
+            'event': kind,
+            'started': time.perf_counter(),
+            'depth': 1,
+            'fields': fields,
+            'stages': {},
+            'counters': {},
+            'api_calls': 0
+        }
+
+    def end_trace(self) -> Optional[Dict]:
+        """요청 단위 기록을 종료하고 구조화된 JSON 로그로 출력 (가장 바깥 호출에서만)"""
+        trace = self._current_trace()
+        if trace is None:
+            return None
+        trace['depth'] -= 1
+        if trace['depth'] > 0:
+            return None
+        self._local.trace = None
+
+        duration = time.perf_counter() - trace['started']
+        kind = trace['event']
+        self.observe('query_seconds', duration, kind=kind)
+        self.observe('query_api_calls', trace['api_calls'], kind=kind)
+
+        record = {
+            'event': kind,
+            **trace['fields'],
+            'duration_seconds': round(duration, 6),
+            'stages': {stage: round(sec, 6) for stage, sec in trace['stages'].items()},
+            'counters': trace['counters']
+        }
+        logger.info(json.dumps(record, ensure_ascii=False))
+        return record
+
+    def snapshot(self) -> Dict:
+        """현재까지 집계된 지표를 dict 로 반환"""
+        with self._lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            summaries = [
+                {'name': name, 'labels': dict(labels), 'count': s[0], 'sum': s[1], 'max': s[2]}
+                for (name, labels), s in sorted(self._summaries.items())
+            ]
+        return {'counters': counters, 'summaries': summaries}
+
+    def to_json(self) -> str:
+        """집계 지표를 JSON 문자열로 반환"""
+        return json.dumps(self.snapshot(), ensure_ascii=False)
+
+    def _format_labels(self, labels: LabelKey) -> str:
+        if not labels:
+            return ''
+        pairs = []
+        for k, v in labels:
+            v = v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            pairs.append(f'{k}="{v}"')
+        return '{' + ','.join(pairs) + '}'
+
+    def to_prometheus(self) -> str:
+        """집계 지표를 Prometheus 텍스트 포맷으로 반환"""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            summaries = sorted(self._summaries.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            metric = f'{self.prefix}_{name}'
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} counter')
+                typed.add(metric)
+            lines.append(f'{metric}{self._format_labels(labels)} {value}')
+
+        # summary 는 _count/_sum 만 허용되므로 최대값은 별도 gauge 패밀리(<name>_max)로 출력
+        for name, family in groupby(summaries, key=lambda item: item[0][0]):
+            family = list(family)
+            metric = f'{self.prefix}_{name}'
+            lines.append(f'# TYPE {metric} summary')
+            for (_, labels), (count, total, _) in family:
+                label_str = self._format_labels(labels)
+                lines.append(f'{metric}_count{label_str} {count}')
+                lines.append(f'{metric}_sum{label_str} {total:.6f}')
+            lines.append(f'# TYPE {metric}_max gauge')
+            for (_, labels), (_, _, maximum) in family:
+                lines.append(f'{metric}_max{self._format_labels(labels)} {maximum:.6f}')
+
+        return '\n'.join(lines) + '\n'
+
+    def dump_prometheus(self, path: str):
+        """Prometheus 텍스트 포맷으로 파일 저장"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        logger.info(f'📈 성능 지표 저장 완료: {path}')
+
+    def reset(self):
+        """집계 지표 초기화"""
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+metrics = Metrics(enabled=METRICS_ENABLED)
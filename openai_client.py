@@ -1,19 +1,37 @@
 import openai
 import logging
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterator
 from config import OPENAI_API_KEY, OPENAI_CONFIG_IMP, OPENAI_CONFIG_REC
 import re
+import time
+from metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 class OpenAIClient:
-    def __init__(self, api_key: str = OPENAI_API_KEY):
+    def __init__(self, api_key: str = OPENAI_API_KEY, client=None):
+        # client: openai.OpenAI 호환 객체 주입 (벤치마크용 가짜 클라이언트 등)
         openai.api_key = api_key
-        self.client = openai.OpenAI(api_key=api_key)
+        self.client = client if client is not None else openai.OpenAI(api_key=api_key)
+
+    def _record_call(self, kind: str):
+        """API 호출 수 기록 - 요청을 보내기 전에 호출하여 실패한 호출도 집계"""
+        metrics.incr('openai_api_calls_total', kind=kind)
+
+    def _record_error(self, kind: str):
+        """API 호출 실패 수 기록"""
+        metrics.incr('openai_api_errors_total', kind=kind)
+
+    def _record_usage(self, kind: str, usage):
+        """토큰 사용량 기록"""
+        if usage is None:
+            return
+        metrics.incr('openai_tokens_total', usage.prompt_tokens or 0, kind=kind, type='prompt')
+        metrics.incr('openai_tokens_total', usage.completion_tokens or 0, kind=kind, type='completion')
     
-    def improve_ai_definition(self, term_abbr: str, term_name: str, current_definition: str) -> Optional[str]:
-        """정의 개선용 OpenAI 호출"""
-        prompt = f"""개발자들이 DB를 구성할 때 사용하는 컬럼 이름에 대한 정의를 개선해주세요. \"\"\"개선된 내용만 보여주세요.\"\"\"
+    def _build_definition_prompt(self, term_abbr: str, term_name: str, current_definition: str) -> str:
+        """정의 개선용 프롬프트 구성"""
+        return f"""개발자들이 DB를 구성할 때 사용하는 컬럼 이름에 대한 정의를 개선해주세요. \"\"\"개선된 내용만 보여주세요.\"\"\"
 
             공통표준용어영문약어명: {term_abbr}
             공통표준용어명: {term_name}
@@ -27,14 +45,21 @@ class OpenAIClient:
             - 200-250자 내외로 간결하게 작성
             - 양식은 지정되어 있습니다. 정의된 내용 만 보여주세요."""
 
+    def improve_ai_definition(self, term_abbr: str, term_name: str, current_definition: str) -> Optional[str]:
+        """정의 개선용 OpenAI 호출"""
+        prompt = self._build_definition_prompt(term_abbr, term_name, current_definition)
+
         try:
             logger.info('🤖 OpenAI API 호출 중...')
-            response = self.client.chat.completions.create(
-                model=OPENAI_CONFIG_IMP['model'],
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=OPENAI_CONFIG_IMP['max_tokens'],
-                temperature=OPENAI_CONFIG_IMP['temperature']
-            )
+            self._record_call('improve_definition')
+            with metrics.timer('openai_improve_definition'):
+                response = self.client.chat.completions.create(
+                    model=OPENAI_CONFIG_IMP['model'],
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=OPENAI_CONFIG_IMP['max_tokens'],
+                    temperature=OPENAI_CONFIG_IMP['temperature']
+                )
+            self._record_usage('improve_definition', getattr(response, 'usage', None))
 
             if response:
                 logger.info('✅ AI 응답 성공')
@@ -45,8 +70,70 @@ class OpenAIClient:
                 
         except Exception as e:
             logger.error(f'❌ OpenAI 호출 중 오류: {e}')
+            self._record_error('improve_definition')
             return None
 
+    def improve_ai_definition_stream(self, term_abbr: str, term_name: str, current_definition: str) -> 'DefinitionStream':
+        """정의 개선용 OpenAI 스트리밍 호출 - 토큰이 도착하는 대로 꺼낼 수 있는 DefinitionStream 반환
+
+        `for token in stream:` 으로 소비한 뒤 stream.stats 에서 첫 토큰까지 걸린 시간(ttft),
+        전체 소요 시간(total_latency, 초), 오류 메시지(error, 정상 종료 시 None)를 읽습니다.
+        호출마다 별도의 stats 를 쓰므로 동시에 여러 스트림을 열어도 서로 덮어쓰지 않습니다.
+        """
+        prompt = self._build_definition_prompt(term_abbr, term_name, current_definition)
+        stats = {'ttft': None, 'total_latency': None, 'error': None}
+        return DefinitionStream(self._stream_definition(prompt, stats), stats)
+
+    def _stream_definition(self, prompt: str, stats: Dict) -> Iterator[str]:
+        start = time.perf_counter()
+        stream = None
+
+        try:
+            logger.info('🤖 OpenAI API 스트리밍 호출 중...')
+            self._record_call('improve_definition_stream')
+            stream = self.client.chat.completions.create(
+                model=OPENAI_CONFIG_IMP['model'],
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=OPENAI_CONFIG_IMP['max_tokens'],
+                temperature=OPENAI_CONFIG_IMP['temperature'],
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+
+            usage = None
+            for chunk in stream:
+                # include_usage 옵션으로 마지막 청크에 토큰 사용량이 포함됨
+                if getattr(chunk, 'usage', None):
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if stats['ttft'] is None:
+                    stats['ttft'] = time.perf_counter() - start
+                    logger.info(f"⏱️ 첫 토큰 수신: {stats['ttft']:.2f}초")
+                yield delta
+
+            logger.info('✅ AI 스트리밍 응답 완료')
+            self._record_usage('improve_definition_stream', usage)
+
+        except Exception as e:
+            # 중간에 끊긴 경우 호출 측에서 잘린 정의를 성공으로 처리하지 않도록 오류 기록
+            logger.error(f'❌ OpenAI 스트리밍 호출 중 오류: {e}')
+            self._record_error('improve_definition_stream')
+            stats['error'] = str(e)
+
+        finally:
+            # 소비 측이 중간에 close() 해도 HTTP 스트림 정리와 지표 기록이 즉시 수행됨
+            if stream is not None and hasattr(stream, 'close'):
+                stream.close()
+            stats['total_latency'] = time.perf_counter() - start
+            if stats['ttft'] is not None:
+                metrics.observe('openai_ttft_seconds', stats['ttft'], kind='improve_definition_stream')
+                metrics.annotate(ttft_seconds=round(stats['ttft'], 6))
+            metrics.record_stage('openai_improve_definition_stream', stats['total_latency'])
+
     def generate_ai_recommendations(self, word: str, similar_terms: List[str], similar_abbrs: List[str]) -> str:
         """OpenAI GPT로 약어 생성 - 유사 용어가 있으면 선택, 없으면 새로 생성"""
         
@@ -91,12 +178,15 @@ class OpenAIClient:
         
         try:
             logger.info('🤖 OpenAI API 호출 중...')
-            response = self.client.chat.completions.create(
-                model=OPENAI_CONFIG_REC['model'],
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=OPENAI_CONFIG_REC['max_tokens'],
-                temperature=OPENAI_CONFIG_REC['temperature']
-            )
+            self._record_call('generate_recommendations')
+            with metrics.timer('openai_generate_recommendations'):
+                response = self.client.chat.completions.create(
+                    model=OPENAI_CONFIG_REC['model'],
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=OPENAI_CONFIG_REC['max_tokens'],
+                    temperature=OPENAI_CONFIG_REC['temperature']
+                )
+            self._record_usage('generate_recommendations', getattr(response, 'usage', None))
 
             if response:
                 logger.info('✅ AI 응답 성공')
@@ -109,6 +199,7 @@ class OpenAIClient:
                 elif len(similar_terms) > 0 and result == 'NONE':
                     # 적합한 용어가 없다고 판단한 경우 - 새로 생성
                     logger.info('🆕 적합한 기존 용어 없음, 새로 생성')
+                    metrics.incr('openai_none_fallback_total')
                     return self.generate_ai_recommendations(word, [], [])  # 빈 리스트로 재귀 호출
                 else:
                     # 새로 생성된 약어 반환
@@ -120,6 +211,7 @@ class OpenAIClient:
                 
         except Exception as e:
             logger.error(f'❌ OpenAI 호출 중 오류: {e}')
+            self._record_error('generate_recommendations')
             return None
             
     def test_connection(self) -> bool:
@@ -143,4 +235,31 @@ class OpenAIClient:
                 
         except Exception as e:
             logger.error(f'❌ OpenAI API 테스트 실패: {e}')
-            return False
\ No newline at end of file
+            return False
+
+
+class DefinitionStream:
+    """정의 개선 스트림 - 토큰 iterator 와 호출별 통계(stats)를 함께 제공
+
+    스트림을 끝까지 소비하거나 close() 하면 stats 의 total_latency 가 채워집니다.
+    with 문으로 사용하면 중간에 빠져나가도 바로 정리됩니다.
+    """
+
+    def __init__(self, tokens: Iterator[str], stats: Dict):
+        self._tokens = tokens
+        self.stats = stats
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        return next(self._tokens)
+
+    def close(self):
+        self._tokens.close()
+
+    def __enter__(self) -> 'DefinitionStream':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
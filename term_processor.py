@@ -1,32 +1,34 @@
 import logging
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Callable
 from config import COLUMN_MAPPING, OPENAI_API_KEY
 from openai_client import OpenAIClient
 from konlpy.tag import Okt
 import numpy as np
 from data_loader import DataLoader
 from openai import OpenAI
+from metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 class TermProcessor:
-    def __init__(self, openai_client: OpenAIClient, data_loader: DataLoader):
+    def __init__(self, openai_client: OpenAIClient, data_loader: DataLoader, embedding_client=None, okt=None):
         self.openai_client = openai_client
         self.data_loader = data_loader
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = embedding_client if embedding_client is not None else OpenAI(api_key=OPENAI_API_KEY)
 
         # 데이터 로드
         terms, words = self.data_loader.load_data()
         self.sheet1_abbr_list, self.term_data, self.abbr_data, self.term_embeddings = self.data_loader.load_data_rec(terms, words)
         
         # KoNLPy 초기화
-        self.okt = Okt()
+        self.okt = okt if okt is not None else Okt()
 
         self.worksheet2 = None
 
-    def improve_term_definition(self, term_abbr: str, terms: List[Dict]) -> Dict:
-        """용어 정의 개선"""
+    def improve_term_definition(self, term_abbr: str, terms: List[Dict], on_token: Optional[Callable[[str], None]] = None) -> Dict:
+        """용어 정의 개선 - on_token 이 주어지면 스트리밍으로 토큰마다 호출"""
         logger.info(f'\n🔍 용어 정의 개선 시작: {term_abbr}')
+        metrics.start_trace('improve_term_definition', term_abbr=term_abbr, stream=on_token is not None)
         
         try:
             # 1단계: 용어 검색
@@ -68,9 +70,17 @@ class TermProcessor:
             
             # 3단계: AI 정의 개선
             logger.info('3️⃣ AI 정의 개선 중...')
-            improved_definition = self.openai_client.improve_ai_definition(
-                term_abbr, term_name, current_definition
-            )
+            stream_stats = {}
+            if on_token:
+                improved_definition, stats = self._consume_definition_stream(
+                    self.openai_client.improve_ai_definition_stream(term_abbr, term_name, current_definition),
+                    on_token
+                )
+                stream_stats = {'ttft': stats.get('ttft'), 'total_latency': stats.get('total_latency')}
+            else:
+                improved_definition = self.openai_client.improve_ai_definition(
+                    term_abbr, term_name, current_definition
+                )
             
             if not improved_definition:
                 return {
@@ -82,7 +92,8 @@ class TermProcessor:
                 'success': True,
                 'current_definition': current_definition,
                 'improved_definition': improved_definition,
-                'message': '정의가 성공적으로 개선되었습니다.'
+                'message': '정의가 성공적으로 개선되었습니다.',
+                **stream_stats
             }
             
         except Exception as e:
@@ -92,11 +103,38 @@ class TermProcessor:
                 'message': f'시스템 오류: {str(e)}',
                 'error': str(e)
             }
+        finally:
+            metrics.end_trace()
             
     
+    def _consume_definition_stream(self, stream, on_token: Callable[[str], None]) -> Tuple[Optional[str], Dict]:
+        """스트림의 토큰을 on_token 으로 넘기면서 모아 최종 정의와 통계 반환
+
+        스트림이 오류로 끝나면 받은 토큰이 있더라도 정의는 None 입니다.
+        on_token 에서 예외가 나도(예: 클라이언트 연결 끊김) 스트림은 즉시 닫힙니다.
+        """
+        chunks = []
+        with stream:
+            for token in stream:
+                chunks.append(token)
+                on_token(token)
+
+        stats = stream.stats
+        if stats.get('error'):
+            logger.error(f"❌ 스트리밍 중단으로 정의 개선 실패: {stats['error']}")
+            return None, stats
+        return ''.join(chunks).strip(), stats
+
     def get_embedding(self, text: str, model: str = "text-embedding-3-small") -> np.ndarray:
         """텍스트를 OpenAI embedding으로 변환"""
-        response = self.client.embeddings.create(input=[text], model=model, dimensions=1536)
+        metrics.incr('openai_api_calls_total', kind='embedding')
+        try:
+            with metrics.timer('get_embedding'):
+                response = self.client.embeddings.create(input=[text], model=model, dimensions=1536)
+        except Exception:
+            metrics.incr('openai_api_errors_total', kind='embedding')
+            raise
+        metrics.incr('openai_tokens_total', response.usage.prompt_tokens, kind='embedding', type='prompt')
         return np.array(response.data[0].embedding)
 
     def find_permutation_match(self, abbr: List[str], abbr_list: List[str]) -> Optional[str]:
@@ -111,24 +149,35 @@ class TermProcessor:
         best_term = []
         best_abbr = []
         
-        for term, emb in zip(self.term_data, self.term_embeddings):
-            if emb is not None and len(emb) == len(word_emb):  # 차원 체크 추가
-                sim = np.dot(word_emb, emb) / (np.linalg.norm(word_emb) * np.linalg.norm(emb))
-                if sim > 0.3:
-                    best_term.append(term)
-                    best_abbr.append(self.abbr_data[self.term_data.index(term)])
+        with metrics.timer('similarity_search'):
+            for term, emb in zip(self.term_data, self.term_embeddings):
+                if emb is not None and len(emb) == len(word_emb):  # 차원 체크 추가
+                    sim = np.dot(word_emb, emb) / (np.linalg.norm(word_emb) * np.linalg.norm(emb))
+                    if sim > 0.3:
+                        best_term.append(term)
+                        best_abbr.append(self.abbr_data[self.term_data.index(term)])
         
         return best_term, best_abbr
 
     def recommend_abbreviation(self, text: str) -> List[str]:
         """KoNLPy로 형태소 분석 + embedding 유사도 비교 + 약어 생성/대체"""
+        metrics.start_trace('recommend_abbreviation', text=text)
+        try:
+            return self._recommend_abbreviation(text)
+        finally:
+            metrics.end_trace()
+
+    def _recommend_abbreviation(self, text: str) -> List[str]:
         abbr = []
-        pos_result = self.okt.pos(text)
+        with metrics.timer('okt_pos'):
+            pos_result = self.okt.pos(text)
         print("검색어 형태소 분석 결과:", pos_result)
         for word, pos in pos_result:
             if word.upper() in self.term_data:
+                metrics.incr('lookup_total', source='term_data', result='hit')
                 abbr.append(self.abbr_data[self.term_data.index(word.upper())])
             elif pos not in ['Josa', 'Eomi', 'Punctuation']:
+                metrics.incr('lookup_total', source='term_data', result='miss')
                 similar_term, similar_abbr = self.find_most_similar_term(word)
                 new_abbr = self.openai_client.generate_ai_recommendations(word, similar_term, similar_abbr)
                 print(f"신규 약어 생성: {word} → {new_abbr}")
@@ -136,8 +185,10 @@ class TermProcessor:
         # sheet1의 약어 리스트 중 일치하는 약어 유무 파악
         matched_abbr = self.find_permutation_match(abbr, self.sheet1_abbr_list)
         if matched_abbr:
+            metrics.incr('lookup_total', source='sheet1_abbr', result='hit')
             abbr = [matched_abbr]
             print("기존 약어 사용")
         else:
+            metrics.incr('lookup_total', source='sheet1_abbr', result='miss')
             print("신규 약어 사용")
         return '_'.join(abbr)
\ No newline at end of file
@@ -0,0 +1,73 @@
+import json
+import numpy as np
+import pytest
+from dictionary_auditor import DictionaryAuditor
+
+
+def _dictionary(n, dim=16, n_clusters=25, seed=0):
+    """군집 임베딩 사전 - 임베딩 없음/차원 불일치/중복 단어를 섞음"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim))
+    terms = [f'단어{i}' for i in range(n)]
+    abbrs = [f'W{i}' for i in range(n)]
+    embeddings = [centers[i % n_clusters] + 0.3 * rng.standard_normal(dim) for i in range(n)]
+    embeddings[3] = None
+    embeddings[7] = rng.standard_normal(dim + 1)
+    terms[11], abbrs[11] = terms[10], 'W10X'
+    abbrs[13] = abbrs[12]
+    return terms, abbrs, embeddings
+
+
+def _brute_force_pairs(terms, abbrs, embeddings, threshold):
+    valid = [i for i, emb in enumerate(embeddings) if emb is not None and len(emb) == len(embeddings[0])]
+    matrix = np.array([embeddings[i] for i in valid], dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    sims = matrix @ matrix.T
+    pairs = set()
+    for r in range(len(valid)):
+        for c in range(r + 1, len(valid)):
+            a, b = valid[r], valid[c]
+            if sims[r, c] >= threshold and abbrs[a] != abbrs[b] and terms[a] != terms[b]:
+                pairs.add((terms[a], abbrs[a], terms[b], abbrs[b]))
+    return pairs
+
+
+@pytest.mark.parametrize('block_size', [1, 37, 500, 2048])
+def test_blocked_scan_matches_brute_force(block_size):
+    terms, abbrs, embeddings = _dictionary(500)
+    auditor = DictionaryAuditor(terms, abbrs, embeddings, [], threshold=0.9, block_size=block_size)
+
+    records = list(auditor.find_similar_pairs())
+    pairs = [(r['word_a'], r['abbr_a'], r['word_b'], r['abbr_b']) for r in records]
+
+    expected = _brute_force_pairs(terms, abbrs, embeddings, 0.9)
+    assert expected
+    # 대각 블록 중복 제거 - 자기 자신/역순 쌍 없이 한 번씩만
+    assert len(pairs) == len(set(pairs))
+    assert all((word_a, abbr_a) != (word_b, abbr_b) for word_a, abbr_a, word_b, abbr_b in pairs)
+    assert set(pairs) == expected
+    assert all(r['similarity'] >= 0.9 - 1e-4 for r in records)
+
+
+def test_abbr_and_sheet1_conflicts():
+    auditor = DictionaryAuditor(
+        ['고객', '고객', '번호', '넘버', ''], ['CUST', 'CSTMR', 'NO', 'NO', 'X'], [],
+        ['CUST_NO', 'NO_CUST', 'CUST_NO', 'DT', ''], threshold=0.9, block_size=8
+    )
+
+    records = list(auditor.find_abbr_conflicts()) + list(auditor.find_sheet1_conflicts())
+
+    assert sorted(records, key=json.dumps) == sorted([
+        {'type': 'abbr_multiple_words', 'abbr': 'NO', 'words': ['넘버', '번호']},
+        {'type': 'word_multiple_abbrs', 'word': '고객', 'abbrs': ['CSTMR', 'CUST']},
+        {'type': 'sheet1_duplicate_abbr', 'abbr': 'CUST_NO', 'count': 2},
+        {'type': 'sheet1_permutation_conflict', 'abbrs': ['CUST_NO', 'NO_CUST']},
+    ], key=json.dumps)
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'block_size': 0}, {'block_size': -1}, {'threshold': 0}, {'threshold': 1.5}
+])
+def test_invalid_parameters_rejected(kwargs):
+    with pytest.raises(ValueError):
+        DictionaryAuditor([], [], [], [], **kwargs)
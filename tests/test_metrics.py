@@ -0,0 +1,111 @@
+import json
+import re
+import tracemalloc
+from metrics import Metrics
+
+
+def _families(text):
+    """Prometheus 텍스트를 {패밀리명: (타입, [샘플 줄])} 로 분해"""
+    families = {}
+    current = None
+    for line in text.strip().splitlines():
+        if line.startswith('# TYPE '):
+            _, _, name, kind = line.split(' ')
+            assert name not in families, f'{name} 패밀리가 두 번 선언됨'
+            families[name] = (kind, [])
+            current = name
+        else:
+            families[current][1].append(line)
+    return families
+
+
+def test_prometheus_summary_has_only_count_and_sum():
+    m = Metrics()
+    m.observe('stage_seconds', 0.5, stage='okt_pos')
+    m.observe('stage_seconds', 1.5, stage='okt_pos')
+    m.observe('stage_seconds', 2.0, stage='get_embedding')
+
+    families = _families(m.to_prometheus())
+
+    kind, samples = families['termrec_stage_seconds']
+    assert kind == 'summary'
+    for line in samples:
+        assert re.match(r'termrec_stage_seconds_(count|sum)\{', line), line
+    assert 'termrec_stage_seconds_count{stage="okt_pos"} 2' in samples
+    assert 'termrec_stage_seconds_sum{stage="okt_pos"} 2.000000' in samples
+
+    kind, samples = families['termrec_stage_seconds_max']
+    assert kind == 'gauge'
+    assert 'termrec_stage_seconds_max{stage="okt_pos"} 1.500000' in samples
+    assert 'termrec_stage_seconds_max{stage="get_embedding"} 2.000000' in samples
+
+
+def test_prometheus_max_family_follows_its_summary():
+    m = Metrics()
+    m.observe('query_seconds', 1.0, kind='recommend_abbreviation')
+    m.observe('stage_seconds', 1.0, stage='okt_pos')
+    m.incr('openai_api_calls_total', kind='embedding')
+
+    names = list(_families(m.to_prometheus()))
+    assert names == [
+        'termrec_openai_api_calls_total',
+        'termrec_query_seconds', 'termrec_query_seconds_max',
+        'termrec_stage_seconds', 'termrec_stage_seconds_max'
+    ]
+
+
+def test_prometheus_label_escaping():
+    m = Metrics()
+    m.incr('lookup_total', source='a"b\\c\nd')
+    assert 'termrec_lookup_total{source="a\\"b\\\\c\\nd"} 1' in m.to_prometheus()
+
+
+def test_trace_counters_keep_labels_and_nested_traces_merge(caplog):
+    m = Metrics()
+    with caplog.at_level('INFO', logger='metrics'):
+        m.start_trace('improve_term_definition', term_abbr='A_B')
+        m.start_trace('improve_term_definition', term_abbr='ignored', stream=True)
+        m.incr('lookup_total', source='term_data', result='hit')
+        m.incr('lookup_total', source='term_data', result='miss')
+        m.incr('openai_api_calls_total', kind='embedding')
+        m.incr('openai_api_calls_total', kind='generate_recommendations')
+        m.record_stage('okt_pos', 0.25)
+        assert m.end_trace() is None
+        record = m.end_trace()
+
+    assert record['term_abbr'] == 'A_B'
+    assert record['stream'] is True
+    assert record['counters']['lookup_total{result=hit,source=term_data}'] == 1
+    assert record['counters']['lookup_total{result=miss,source=term_data}'] == 1
+    assert record['stages'] == {'okt_pos': 0.25}
+    assert json.loads(caplog.records[-1].getMessage()) == record
+
+    api_calls = next(s for s in m.snapshot()['summaries'] if s['name'] == 'query_api_calls')
+    assert api_calls['sum'] == 2
+
+
+def test_disabled_metrics_record_nothing():
+    m = Metrics(enabled=False)
+    m.incr('lookup_total')
+    with m.timer('okt_pos'):
+        pass
+    assert m.snapshot() == {'counters': [], 'summaries': []}
+
+
+def test_memory_phase_keeps_peak_across_stages():
+    m = Metrics()
+    m.track_memory = True
+    tracemalloc.start()
+    try:
+        with m.memory_phase() as phase:
+            with m.timer('large'):
+                block = bytearray(50 * 1024 * 1024)
+                del block
+            with m.timer('small'):
+                block = bytearray(1024)
+    finally:
+        tracemalloc.stop()
+
+    stage_peaks = {s['labels']['stage']: s['max'] for s in m.snapshot()['summaries'] if s['name'] == 'stage_peak_bytes'}
+    assert stage_peaks['large'] >= 50 * 1024 * 1024
+    assert phase['peak_bytes'] >= max(stage_peaks.values())